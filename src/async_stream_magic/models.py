@@ -1,37 +1,43 @@
 """Asynchronous Python client for StreamMagic Devices."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class Info(BaseModel):
     """Object holding the StreamMagic device information."""
-    
-    name: str = Field(..., alias="name")
-    model: str = Field(..., alias="model")
-    timezone: str = Field(..., alias="timezone")
-    locale: str = Field(..., alias="locale")
-    udn: str = Field(..., alias="udn")
-    unit_id: str = Field(..., alias="unit_id")
+
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    name: str
+    model: str
+    timezone: str
+    locale: str
+    udn: str
+    unit_id: str
     api_version: str = Field(..., alias="api")
 
 class Source(BaseModel):
     """Object holding the aviable StreamMagic device sources."""
 
-    id: str = Field(..., alias="id")
-    name: str = Field(..., alias="name")
-    default_name: str = Field(..., alias="default_name")
-    nameable: bool = Field(..., alias="nameable")
-    ui_selectable: bool = Field(..., alias="ui_selectable")
-    description: str = Field(..., alias="description")
-    description_locale: str = Field(..., alias="description_locale")
-    preferred_order: int = Field(..., alias="preferred_order")
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    id: str
+    name: str
+    default_name: str
+    nameable: bool
+    ui_selectable: bool
+    description: str
+    description_locale: str
+    preferred_order: int
 
 class State(BaseModel):
     """Object holding the State of StreamMagic device."""
 
-    source: str = Field(..., alias="source")
-    power: bool = Field(..., alias="power")
-    pre_amp_mode: bool = Field(..., alias="pre_amp_mode")
-    pre_amp_state: bool = Field(..., alias="pre_amp_state")
-    mute: bool = Field(..., alias="mute")
-    volume_step: int = Field(..., alias="volume_step")
-    volume_percent: int = Field(..., alias="volume_percent")
-    volume_db: int = Field(alias="volume_db")
\ No newline at end of file
+    model_config = ConfigDict(frozen=True, extra="ignore", populate_by_name=True)
+
+    source: str
+    power: bool
+    pre_amp_mode: bool
+    pre_amp_state: bool
+    mute: bool
+    volume_step: int
+    volume_percent: int
+    volume_db: int
\ No newline at end of file
@@ -2,39 +2,86 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
 from importlib import metadata
 import socket
+import time
+from types import TracebackType
 from typing import Any, Optional, Type
 
-from aiohttp import ClientError, ClientResponseError
-
-import async_timeout
+from aiohttp import ClientError, ClientResponseError, ClientTimeout, TCPConnector
 from aiohttp.client import ClientSession
 from aiohttp.hdrs import METH_GET
+import orjson
 from yarl import URL
 
 from .exceptions import StreamMagicError, StreamMagicConnectionError
 from .models import Info, Source, State
 
-@dataclass
+_VERSION = metadata.version(__package__)
+_DEFAULT_HEADERS = {
+    "User-Agent": f"PythonAsyncStreamMagic/{_VERSION}",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Encoding": "gzip, deflate",
+}
+
 class StreamMagic:
     """Main class for handling connections with a StreamMagic device."""
 
-    def __init__(self, host: str, session: ClientSession | None=None) -> None:
+    def __init__(self, host: str, session: ClientSession | None=None,
+                 cache_ttl: float | None=None) -> None:
+        """Initialize the StreamMagic client.
+        Args:
+            host: Hostname or IP address of the StreamMagic device.
+            session: Optional ClientSession to use instead of an own one.
+            cache_ttl: Seconds to cache device info and the source list;
+                0 or None (the default) disables caching.
+        """
         self._host = host
         self._request_timeout = 100
+        self._timeout = ClientTimeout(total=self._request_timeout)
         self._close_session: bool = False
         self._session = session
         if session is None:
-            self._session = ClientSession()
+            # IPv4 only; inject a ClientSession for IPv6-only deployments.
+            connector = TCPConnector(
+                family=socket.AF_INET,
+                limit=10,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+                enable_cleanup_closed=True,
+            )
+            self._session = ClientSession(
+                connector=connector, timeout=self._timeout)
             self._close_session = True
 
+        base = URL.build(scheme="http", host=host)
+        self._state_url = base.with_path("/smoip/zone/state").with_query(
+            {"zone": "ZONE1"})
+        self._urls: dict[str, URL] = {
+            "info": base.with_path("/smoip/system/info"),
+            "sources": base.with_path("/smoip/system/sources"),
+            "state": self._state_url,
+        }
+
+        self._batch_delay = 0.02
+        self._pending: dict[str, str | int] = {}
+        self._pending_futures: list[asyncio.Future[None]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+        self._send_lock = asyncio.Lock()
+
+        self._cache_ttl = cache_ttl or 0.0
+        self._info_cache: tuple[float, Info] | None = None
+        self._sources_cache: tuple[float, list[Source]] | None = None
+
     async def close(self) -> None:
         """Close open client session."""
-        if self._session and self._close_session:
-             await self._session.close()
-        return await self._session.close()
+        self._flush()
+        while self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        if self._session is not None and self._close_session:
+            await self._session.close()
+            self._session = None
         
     async def __aenter__(self) -> "StreamMagic":
         """Async enter.
@@ -47,14 +94,13 @@ class StreamMagic:
         self,
         exc_type: Optional[Type[BaseException]],
         exc_val: Optional[BaseException],
-        exc_tb: Optional[async_timeout.TracebackType],
+        exc_tb: Optional[TracebackType],
     ) -> Optional[bool]:
         await self.close()
         return None
     
     
-    async def _request(self, path: str,
-                       query: str = "",
+    async def _request(self, url: URL,
                        method: str = METH_GET,
                        ) -> dict[str, Any]:
         """Handle a request to a StreamMagic device.
@@ -68,22 +114,14 @@ class StreamMagic:
             
         """
 
-        version = metadata.version(__package__)
-        url = URL.build(
-            scheme="http", host=self._host, path=path, query=query)
-
-        headers = {
-            "User-Agent": f"PythonAsyncStreamMagic/{version}",
-            "Accept": "application/json, text/plain, */*",
-        }
-
         try:
-            async with async_timeout.timeout(self._request_timeout):
-                response = await self._session.get(
+            response = await self._session.get(
                 url,
-                headers=headers,
-                )
-                response.raise_for_status()
+                headers=_DEFAULT_HEADERS,
+                timeout=self._timeout,
+            )
+            response.raise_for_status()
+            body = await response.read()
         except asyncio.TimeoutError as exception:
             raise StreamMagicConnectionError(
                 "Timeout occurred while connecting to StreamMagic device"
@@ -96,79 +134,197 @@ class StreamMagic:
             raise StreamMagicConnectionError(
                 {"Error occurred while communicating with StreamMagic device", exception}
             ) from exception
-        except Exception as exception:
-            print(exception)
 
-        content_type = response.headers.get("Content-Type", "")
-        if "application/json" not in content_type:
-            text = await response.text()
+        try:
+            result = orjson.loads(body)
+        except orjson.JSONDecodeError as exception:
+            raise StreamMagicError(
+                "Unexpected response from StreamMagic device",
+                {"response": body[:512]},
+            ) from exception
+        if not isinstance(result, dict):
             raise StreamMagicError(
                 "Unexpected response from StreamMagic device",
-                {"Content-Type": content_type, "response": text},
+                {"response": body[:512]},
             )
-        await asyncio.sleep(0)
-        return await response.json()
+        return result
+
+    async def _queue_state_mutation(self, *, flush: bool = False,
+                                    **params: str | int) -> None:
+        """Queue a change of the StreamMagic device state.
+        Mutations arriving within the batch delay are merged into a single
+        request against the state endpoint. A volume step and an absolute
+        volume never share a request, as their order matters.
+        Args:
+            flush: Send the pending mutations immediately.
+            params: Query parameters to set on the state endpoint.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        step = int(params.pop("volume_step_change", 0))
+        if ((step and "volume_percent" in self._pending)
+                or ("volume_percent" in params
+                    and "volume_step_change" in self._pending)):
+            self._flush()
+        if step:
+            step += int(self._pending.pop("volume_step_change", 0))
+            if step:
+                params["volume_step_change"] = step
+        self._pending.update(params)
+        self._pending_futures.append(future)
+        if flush:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self._batch_delay, self._flush)
+        await future
+
+    def _flush(self) -> None:
+        """Start sending all pending mutations in their own task."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        params, self._pending = self._pending, {}
+        futures, self._pending_futures = self._pending_futures, []
+        if not futures:
+            return
+        task = asyncio.ensure_future(self._send_batch(params, futures))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _send_batch(self, params: dict[str, str | int],
+                          futures: list[asyncio.Future[None]]) -> None:
+        """Send one batch of mutations and resolve its waiting callers.
+        Batches are sent one at a time, in the order they were flushed.
+        """
+        async with self._send_lock:
+            try:
+                if params:
+                    await self._request(self._state_url.update_query(params))
+            except asyncio.CancelledError:
+                for future in futures:
+                    future.cancel()
+                raise
+            except Exception as exception:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exception)
+                return
+        for future in futures:
+            if not future.done():
+                future.set_result(None)
 
     async def get_info(self) -> Info:
         """Get devices information from StreamMagic device.
         Returns:
             A Info object, with information about the StreamMagic device.
         """
-        data = await self._request(path="/smoip/system/info")
-        return Info.parse_obj(data["data"])
+        if (self._info_cache
+                and time.monotonic() - self._info_cache[0] < self._cache_ttl):
+            return self._info_cache[1]
+        data = await self._request(self._urls["info"])
+        info = Info.model_validate(data["data"])
+        if self._cache_ttl:
+            self._info_cache = (time.monotonic(), info)
+        return info
 
-    async def get_sources(self) -> list(Source): # type: ignore
+    async def get_sources(self) -> list[Source]:
         """Get source list from StreamMagic device.
         Returns:
             A Settings object, with information about the StreamMagic device.
         """
-        request = await self._request(path="/smoip/system/sources")
-        data = request["data"]["sources"]
-        source_list = []
-        for item in data:
-            source_list.append(Source.parse_obj(item))
-        return source_list
+        if (self._sources_cache
+                and time.monotonic() - self._sources_cache[0] < self._cache_ttl):
+            return list(self._sources_cache[1])
+        request = await self._request(self._urls["sources"])
+        sources = [Source.model_validate(item) for item in request["data"]["sources"]]
+        if self._cache_ttl:
+            self._sources_cache = (time.monotonic(), sources)
+        return list(sources)
+
+    def invalidate_info(self) -> None:
+        """Drop the cached device information."""
+        self._info_cache = None
+
+    def invalidate_sources(self) -> None:
+        """Drop the cached source list."""
+        self._sources_cache = None
 
     async def get_state(self) -> State:
         """Get the current state of StreamMagic device.
         Returns:
             A State object, with the current StreamMagic device state.
         """
-        data = await self._request(path="/smoip/zone/state", query="zone=ZONE1")
-        return State.parse_obj(data["data"])
+        data = await self._request(self._urls["state"])
+        return State.model_validate(data["data"])
 
-    async def set_power_on(self) -> None:
-        """Set the power of StreamMagic device on."""
-        await self._request(path="/smoip/zone/state", query="zone=ZONE1&power=true")
+    async def get_status(self) -> tuple[Info, State]:
+        """Get information and current state of StreamMagic device.
+        Both requests are issued concurrently over the shared session.
+        Returns:
+            A tuple of the Info and State objects of the StreamMagic device.
+        """
+        info, state = await asyncio.gather(self.get_info(), self.get_state())
+        return info, state
 
-    async def set_power_off(self) -> None:
-        """Set the power of StreamMagic device on."""
-        await self._request(path="/smoip/zone/state", query="zone=ZONE1&power=false")
+    async def set_power_on(self, flush: bool = False) -> None:
+        """Set the power of StreamMagic device on.
+        Args:
+            flush: Send the change immediately instead of batching it.
+        """
+        await self._queue_state_mutation(flush=flush, power="true")
 
-    async def set_volume_step_up(self) -> None:
-        """Set the power of StreamMagic device on."""
-        await self._request(path="/smoip/zone/state", query="zone=ZONE1&volume_step_change=1")
+    async def set_power_off(self, flush: bool = False) -> None:
+        """Set the power of StreamMagic device off.
+        Args:
+            flush: Send the change immediately instead of batching it.
+        """
+        await self._queue_state_mutation(flush=flush, power="false")
+
+    async def set_volume_step_up(self, flush: bool = False) -> None:
+        """Raise the volume of StreamMagic device by one step.
+        Args:
+            flush: Send the change immediately instead of batching it.
+        """
+        await self._queue_state_mutation(flush=flush, volume_step_change=1)
 
-    async def set_volume_step_down(self) -> None:
-        """Set the power of StreamMagic device on."""
-        await self._request(path="/smoip/zone/state", query="zone=ZONE1&volume_step_change=-1")
+    async def set_volume_step_down(self, flush: bool = False) -> None:
+        """Lower the volume of StreamMagic device by one step.
+        Args:
+            flush: Send the change immediately instead of batching it.
+        """
+        await self._queue_state_mutation(flush=flush, volume_step_change=-1)
 
-    async def set_volume_percent(self, volume: int) -> None:
-        """Set the power of StreamMagic device on."""
+    async def set_volume_percent(self, volume: int, flush: bool = False) -> None:
+        """Set the volume of StreamMagic device in percent.
+        Args:
+            volume: Volume between 0 and 100.
+            flush: Send the change immediately instead of batching it.
+        """
+        if not isinstance(volume, int) or isinstance(volume, bool):
+            raise StreamMagicError("Volume must be an integer")
         if not 0 <= volume <= 100:
             raise StreamMagicError("Volume not between 0 and 100")
-        query = "zone=ZONE1&volume_percent=" + str(volume)
-        await self._request(path="/smoip/zone/state", query=query)
+        await self._queue_state_mutation(flush=flush, volume_percent=volume)
 
-    async def set_volume_mute_on(self) -> None:
-        """Set the power of StreamMagic device on."""
-        await self._request(path="/smoip/zone/state", query="zone=ZONE1&mute=true")
+    async def set_volume_mute_on(self, flush: bool = False) -> None:
+        """Mute the StreamMagic device.
+        Args:
+            flush: Send the change immediately instead of batching it.
+        """
+        await self._queue_state_mutation(flush=flush, mute="true")
 
-    async def set_volume_mute_off(self) -> None:
-        """Set the power of StreamMagic device on."""
-        await self._request(path="/smoip/zone/state", query="zone=ZONE1&mute=false")
+    async def set_volume_mute_off(self, flush: bool = False) -> None:
+        """Unmute the StreamMagic device.
+        Args:
+            flush: Send the change immediately instead of batching it.
+        """
+        await self._queue_state_mutation(flush=flush, mute="false")
 
-    async def set_source(self, source: Source) -> None:
-        """Set the power of StreamMagic device on."""
-        query = "zone=ZONE1&source=" + source.id
-        await self._request(path="/smoip/zone/state", query=query)
\ No newline at end of file
+    async def set_source(self, source: Source, flush: bool = False) -> None:
+        """Set the source of StreamMagic device.
+        Args:
+            source: Source to select.
+            flush: Send the change immediately instead of batching it.
+        """
+        await self._queue_state_mutation(flush=flush, source=source.id)
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""Tests for batching of StreamMagic state changes."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from yarl import URL
+
+from async_stream_magic import StreamMagic, StreamMagicConnectionError
+
+
+class FakeRequest:
+    """Stand-in for StreamMagic._request recording the sent queries."""
+
+    def __init__(self) -> None:
+        self.queries: list[dict[str, str]] = []
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+        self.error: Exception | None = None
+
+    async def __call__(self, url: URL) -> dict[str, Any]:
+        self.queries.append(dict(url.query))
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return {}
+
+
+def run(test: Any) -> None:
+    """Run a test coroutine against a StreamMagic with a fake _request."""
+
+    async def main() -> None:
+        stream_magic = StreamMagic("127.0.0.1")
+        fake = FakeRequest()
+        stream_magic._request = fake  # type: ignore[method-assign]
+        try:
+            await test(stream_magic, fake)
+        finally:
+            await stream_magic.close()
+
+    asyncio.run(main())
+
+
+def test_mutations_are_merged() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        await asyncio.gather(
+            stream_magic.set_power_on(),
+            stream_magic.set_volume_mute_on(),
+            stream_magic.set_volume_percent(30),
+        )
+        assert fake.queries == [
+            {"zone": "ZONE1", "power": "true", "mute": "true",
+             "volume_percent": "30"},
+        ]
+
+    run(test)
+
+
+def test_volume_steps_are_summed() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        await asyncio.gather(
+            stream_magic.set_volume_step_up(),
+            stream_magic.set_volume_step_up(),
+        )
+        assert fake.queries == [{"zone": "ZONE1", "volume_step_change": "2"}]
+
+    run(test)
+
+
+def test_zero_volume_step_is_not_sent() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        await asyncio.gather(
+            stream_magic.set_volume_step_up(),
+            stream_magic.set_volume_step_down(),
+        )
+        assert not fake.queries
+
+    run(test)
+
+
+def test_volume_step_after_percent_is_sent_separately() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        await asyncio.gather(
+            stream_magic.set_power_on(),
+            stream_magic.set_volume_percent(30),
+            stream_magic.set_volume_step_up(),
+        )
+        assert fake.queries == [
+            {"zone": "ZONE1", "power": "true", "volume_percent": "30"},
+            {"zone": "ZONE1", "volume_step_change": "1"},
+        ]
+
+    run(test)
+
+
+def test_flush_sends_immediately() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        stream_magic._batch_delay = 60
+        pending = asyncio.ensure_future(stream_magic.set_volume_percent(10))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(
+            stream_magic.set_volume_mute_on(flush=True), timeout=1)
+        await asyncio.wait_for(pending, timeout=1)
+        assert fake.queries == [
+            {"zone": "ZONE1", "volume_percent": "10", "mute": "true"},
+        ]
+
+    run(test)
+
+
+def test_errors_reach_every_caller() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        fake.error = StreamMagicConnectionError("offline")
+        results = await asyncio.gather(
+            stream_magic.set_power_on(),
+            stream_magic.set_volume_mute_on(),
+            return_exceptions=True,
+        )
+        assert results == [fake.error, fake.error]
+        assert len(fake.queries) == 1
+
+    run(test)
+
+
+def test_cancelled_caller_does_not_cancel_the_batch() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        fake.release.clear()
+        volume = asyncio.ensure_future(stream_magic.set_volume_percent(10))
+        mute = asyncio.ensure_future(stream_magic.set_volume_mute_on(flush=True))
+        await fake.started.wait()
+        mute.cancel()
+        fake.release.set()
+        await volume
+        with pytest.raises(asyncio.CancelledError):
+            await mute
+        assert fake.queries == [
+            {"zone": "ZONE1", "volume_percent": "10", "mute": "true"},
+        ]
+
+    run(test)
+
+
+def test_close_waits_for_batch_in_flight() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        fake.release.clear()
+        power = asyncio.ensure_future(stream_magic.set_power_on())
+        await fake.started.wait()
+        asyncio.get_running_loop().call_soon(fake.release.set)
+        await stream_magic.close()
+        assert power.done()
+        await power
+
+    run(test)
+
+
+def test_close_sends_pending_mutations() -> None:
+    async def test(stream_magic: StreamMagic, fake: FakeRequest) -> None:
+        stream_magic._batch_delay = 60
+        power = asyncio.ensure_future(stream_magic.set_power_on())
+        await asyncio.sleep(0)
+        await stream_magic.close()
+        await power
+        assert fake.queries == [{"zone": "ZONE1", "power": "true"}]
+
+    run(test)